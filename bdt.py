@@ -1,111 +1,590 @@
 #ham
 import math
-from collections import Counter
-import csv
-
-# Define the Node class
-class Node:
-    def __init__(self, feature=None, decision=None):
-        self.feature = feature
-        self.decision = decision
-        self.children = {}  # Dictionary mapping feature values to child nodes
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numba
+import numpy as np
+import pandas as pd
+from numba import njit, prange
+
+# Subtrees with at least task_threshold rows (TASK_THRESHOLD by default), no
+# deeper than TASK_MAX_DEPTH, are handed to worker processes when
+# build_decision_tree runs with n_jobs != 1; smaller ones are cheaper to
+# build in place than to dispatch.
+TASK_THRESHOLD = 10000
+TASK_MAX_DEPTH = 3
+
+# One record per tree node; leaves have feature == -1
+NODE_DTYPE = np.dtype([
+    ('feature', np.int32),
+    ('decision', np.int32),     # Majority class; the prediction at leaves
+    ('threshold', np.int32),    # -1 unless the node is an ordinal split
+    ('first_child', np.int32),
+    ('n_children', np.int32),
+])
+
+# Double the length of an array, keeping its contents
+def _grow_array(array, min_size):
+    grown = np.empty(max(2 * len(array), min_size), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+# Define the Tree class
+class Tree:
+    """A decision tree stored as flat arrays rather than linked node objects.
+
+    Node i is nodes[i] and the root is node 0. The children of an internal
+    node are child_node[first_child:first_child + n_children], and each is
+    taken when the node's feature value equals the matching child_value
+    entry. Ordinal splits use value 0 for <= threshold and 1 for >.
+    """
+    def __init__(self, capacity=16):
+        self.nodes = np.empty(capacity, dtype=NODE_DTYPE)
+        self.child_value = np.empty(capacity, dtype=np.int32)
+        self.child_node = np.empty(capacity, dtype=np.int32)
+        self.node_count = 0
+        self.child_count = 0
+
+    def add_node(self, decision, feature=-1, threshold=-1):
+        """Append a node with no children yet and return its index."""
+        if self.node_count == len(self.nodes):
+            self.nodes = _grow_array(self.nodes, self.node_count + 1)
+        node_id = self.node_count
+        self.nodes[node_id] = (feature, decision, threshold, -1, 0)
+        self.node_count += 1
+        return node_id
+
+    def add_children(self, node_id, values):
+        """Reserve a contiguous block of child slots for node_id.
+
+        Returns the index of the first slot; child_node is filled in by the
+        caller once each child subtree has been built.
+        """
+        first = self.child_count
+        end = first + len(values)
+        if end > len(self.child_value):
+            self.child_value = _grow_array(self.child_value, end)
+            self.child_node = _grow_array(self.child_node, end)
+        self.child_value[first:end] = values
+        self.nodes['first_child'][node_id] = first
+        self.nodes['n_children'][node_id] = len(values)
+        self.child_count = end
+        return first
+
+    def graft(self, subtree):
+        """Append all nodes of another Tree and return the index of its root."""
+        node_offset = self.node_count
+        child_offset = self.child_count
+        nodes = subtree.nodes[:subtree.node_count].copy()
+        nodes['first_child'][nodes['n_children'] > 0] += child_offset
+        end = node_offset + len(nodes)
+        if end > len(self.nodes):
+            self.nodes = _grow_array(self.nodes, end)
+        self.nodes[node_offset:end] = nodes
+        self.node_count = end
+        end = child_offset + subtree.child_count
+        if end > len(self.child_value):
+            self.child_value = _grow_array(self.child_value, end)
+            self.child_node = _grow_array(self.child_node, end)
+        self.child_value[child_offset:end] = subtree.child_value[:subtree.child_count]
+        self.child_node[child_offset:end] = subtree.child_node[:subtree.child_count] + node_offset
+        self.child_count = end
+        return node_offset
+
+    def predict_row(self, row):
+        """Return the class code predicted for one encoded feature row."""
+        node_id = 0
+        while True:
+            feature, decision, threshold, first, n_children = self.nodes[node_id].item()
+            if feature < 0:
+                return decision
+            value = row[feature]
+            if value < 0:
+                return decision  # Unseen value (UNSEEN_CODE)
+            if threshold >= 0:
+                value = int(value > threshold)
+            for k in range(first, first + n_children):
+                if self.child_value[k] == value:
+                    node_id = self.child_node[k]
+                    break
+            else:
+                # Value never seen at this node during training
+                return decision
 
     def __repr__(self):
-        if self.decision is not None:
-            return f"Leaf(decision={self.decision})"
-        return f"Node(feature={self.feature}, children={len(self.children)})"
+        feature, decision, threshold, first, n_children = self.nodes[0].item()
+        if feature < 0:
+            root = f"Leaf(decision={decision})"
+        elif threshold >= 0:
+            root = f"Node(feature={feature}, threshold={threshold}, children={n_children})"
+        else:
+            root = f"Node(feature={feature}, children={n_children})"
+        return f"Tree(nodes={self.node_count}, root={root})"
+
+# Encode string rows as integer arrays
+def encode_data(data, target_column=-1, orders=None):
+    """Label-encode each column of rows into (X, y, uniques), target's uniques last.
+
+    target_column: index of the label column.
+    orders: {column index: values in real order} for ordinal columns.
+    """
+    # Empty data has no columns to encode; build_decision_tree returns None for it
+    if not data:
+        return np.empty((0, 0), dtype=np.uint8), np.empty(0, dtype=np.uint8), []
+    columns = [np.asarray(col) for col in zip(*data)]
+    orders = {column % len(columns): order for column, order in (orders or {}).items()}
+    uniques = []
+    codes = []
+    for column, col in enumerate(columns):
+        if column in orders:
+            values, inverse = _ordered_codes(column, col, orders[column])
+        else:
+            values, inverse = np.unique(col, return_inverse=True)
+        uniques.append(values)
+        codes.append(inverse)
+    return _assemble_codes(codes, uniques, target_column)
+
+# Look up each entry of col in values, returning (codes, missing mask)
+def _lookup_codes(col, values):
+    sorter = np.argsort(values)
+    positions = np.searchsorted(values, col, sorter=sorter).clip(max=len(values) - 1)
+    codes = sorter[positions]
+    return codes, values[codes] != col
+
+# Encode one column by position in a caller-given value order
+def _ordered_codes(column, col, order):
+    values = np.asarray(order)
+    inverse, missing = _lookup_codes(col, values)
+    if missing.any():
+        raise ValueError(f"Column {column} value {str(col[missing][0])!r} is not in its given order")
+    return values, inverse
+
+# Code given to feature values that were not seen in training
+UNSEEN_CODE = -1
+
+# Encode new rows with the training encoding
+def encode_rows(rows, uniques):
+    """Encode feature-only rows with the uniques returned for the training data.
+
+    Running encode_data or load_csv on new data would build a fresh, different
+    encoding. Here every value gets its training code, and values never seen
+    in training get UNSEEN_CODE, which predict treats as "stop at this node
+    and use its majority class".
+    """
+    feature_uniques = uniques[:-1]
+    for i, row in enumerate(rows):
+        if len(row) != len(feature_uniques):
+            raise ValueError(f"Row {i} has {len(row)} columns, expected {len(feature_uniques)} training features")
+    X = np.full((len(rows), len(feature_uniques)), UNSEEN_CODE, dtype=np.int32)
+    for column, col in enumerate(zip(*rows)):
+        codes, missing = _lookup_codes(np.asarray(col), feature_uniques[column])
+        X[:, column] = np.where(missing, UNSEEN_CODE, codes)
+    return X
+
+# Stack per-column codes into (X, y, uniques) using the narrowest dtype
+def _assemble_codes(codes, uniques, target_column):
+    target_column %= len(codes)
+    y = codes.pop(target_column)
+    uniques.append(uniques.pop(target_column))
+    y = y.astype(np.min_scalar_type(len(uniques[-1]) - 1))
+    if not codes:
+        return np.empty((len(y), 0), dtype=np.uint8), y, uniques
+    max_code = max(len(values) for values in uniques[:-1]) - 1
+    X = np.stack(codes, axis=1).astype(np.min_scalar_type(max_code))
+    return X, y, uniques
+
+# Entropy of each row of a table of class counts
+def entropy_from_counts(counts):
+    """Return the entropy (in bits) of each row of a class-count table."""
+    counts = np.asarray(counts, dtype=np.float64)
+    totals = counts.sum(axis=-1, keepdims=True)
+    p = np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+    plogp = np.zeros_like(p)
+    np.log2(p, out=plogp, where=p > 0)
+    return -np.sum(p * plogp, axis=-1)
 
 # Calculate entropy
-def calculate_entropy(data, target_column):
-    """Calculate the entropy of a dataset."""
-    total_count = len(data)
-    label_counts = Counter(row[target_column] for row in data)
-    entropy = 0.0
-    for count in label_counts.values():
-        p = count / total_count
-        entropy -= p * math.log2(p)
-    return entropy
+def calculate_entropy(y):
+    """Calculate the entropy of a vector of class codes."""
+    if len(y) == 0:
+        return 0.0
+    return float(entropy_from_counts(np.bincount(y)))
+
+# Group row indices by feature value (compiled counting sort)
+@njit(cache=True)
+def _partition_by_value(X, idx, f):
+    """Return (values, grouped_idx, offsets) for the values present in idx.
+
+    grouped_idx holds idx reordered so that rows sharing a value are
+    contiguous; the rows with values[k] are grouped_idx[offsets[k]:offsets[k + 1]].
+    """
+    n = idx.shape[0]
+    n_values = 0
+    for i in range(n):
+        if X[idx[i], f] >= n_values:
+            n_values = X[idx[i], f] + 1
+    counts = np.zeros(n_values + 1, np.int64)
+    for i in range(n):
+        counts[X[idx[i], f] + 1] += 1
+    n_present = 0
+    for v in range(n_values):
+        if counts[v + 1] > 0:
+            n_present += 1
+    values = np.empty(n_present, np.int64)
+    offsets = np.empty(n_present + 1, np.int64)
+    k = 0
+    for v in range(n_values):
+        if counts[v + 1] > 0:
+            values[k] = v
+            offsets[k] = counts[v]
+            k += 1
+        counts[v + 1] += counts[v]
+    offsets[n_present] = n
+    # Stable scatter of the row indices into their value's slot
+    grouped_idx = np.empty_like(idx)
+    for i in range(n):
+        v = X[idx[i], f]
+        grouped_idx[counts[v]] = idx[i]
+        counts[v] += 1
+    return values, grouped_idx, offsets
 
 # Split data by feature
-def split_data_by_feature(data, feature_index):
-    """Split data into subsets based on feature values."""
-    subsets = {}
-    for row in data:
-        feature_value = row[feature_index]
-        if feature_value not in subsets:
-            subsets[feature_value] = []
-        subsets[feature_value].append(row)
-    return subsets
+def split_data_by_feature(X, feature_index, idx=None):
+    """Split rows into groups of row indices based on feature values."""
+    if idx is None:
+        idx = np.arange(X.shape[0])
+    values, grouped_idx, offsets = _partition_by_value(X, idx, feature_index)
+    # Each group is a view into grouped_idx, not a copy
+    return {int(values[k]): grouped_idx[offsets[k]:offsets[k + 1]] for k in range(len(values))}
+
+# Split data on an ordinal threshold
+def split_data_by_threshold(X, feature_index, threshold, idx=None):
+    """Split row indices into {0: value <= threshold, 1: value > threshold}."""
+    if idx is None:
+        idx = np.arange(X.shape[0])
+    above = X[idx, feature_index] > threshold
+    return {0: idx[~above], 1: idx[above]}
 
 # Calculate information gain
-def calculate_information_gain(feature_index, data, target_column):
-    """Calculate the information gain for a feature."""
-    total_entropy = calculate_entropy(data, target_column)
-    total_count = len(data)
-    subsets = split_data_by_feature(data, feature_index)
-
-    weighted_entropy = 0.0
-    for subset in subsets.values():
-        subset_entropy = calculate_entropy(subset, target_column)
-        weighted_entropy += (len(subset) / total_count) * subset_entropy
+def calculate_information_gain(feature_index, X, y, idx=None, total_entropy=None):
+    """Calculate the information gain for a feature over the rows in idx.
+
+    Pass total_entropy when scoring several features of the same node so the
+    parent entropy is only computed once.
+    """
+    if idx is not None:
+        y = y[idx]
+    total_count = len(y)
+    if total_count == 0:
+        return 0.0
+    col = X[:, feature_index] if idx is None else X[idx, feature_index]
+    n_classes = int(y.max()) + 1
+    n_values = int(col.max()) + 1
+    # Contingency table of (feature value, class) counts in a single bincount
+    joint = col.astype(np.intp) * n_classes + y
+    table = np.bincount(joint, minlength=n_values * n_classes).reshape(n_values, n_classes)
+
+    if total_entropy is None:
+        total_entropy = calculate_entropy(y)
+    weights = table.sum(axis=1) / total_count
+    weighted_entropy = float(np.dot(weights, entropy_from_counts(table)))
 
     info_gain = total_entropy - weighted_entropy
     return info_gain
 
-# Determine the majority class
-def majority_class(data, target_column):
-    """Return the most common class in the target column."""
-    counts = Counter(row[target_column] for row in data)
-    return counts.most_common(1)[0][0]
+# Entropy of a single row of class counts (compiled)
+@njit(cache=True)
+def _entropy_of_counts(counts, total):
+    entropy = 0.0
+    for c in range(counts.shape[0]):
+        if counts[c] > 0:
+            p = counts[c] / total
+            entropy -= p * math.log2(p)
+    return entropy
+
+# Score every remaining feature at a node and pick the best one
+@njit(cache=True, parallel=True)
+def best_split(X, y, idx, feat_ids, n_classes, parent_entropy):
+    """Return (best_feature, best_information_gain) over the rows in idx."""
+    n = idx.shape[0]
+    gains = np.empty(feat_ids.shape[0])
+    for k in prange(feat_ids.shape[0]):
+        f = feat_ids[k]
+        n_values = 0
+        for i in range(n):
+            if X[idx[i], f] >= n_values:
+                n_values = X[idx[i], f] + 1
+        # One pass over the rows fills the (feature value, class) table
+        table = np.zeros((n_values, n_classes), np.int64)
+        for i in range(n):
+            row = idx[i]
+            table[X[row, f], y[row]] += 1
+        weighted_entropy = 0.0
+        for v in range(n_values):
+            row_total = 0
+            for c in range(n_classes):
+                row_total += table[v, c]
+            if row_total > 0:
+                weighted_entropy += row_total / n * _entropy_of_counts(table[v], row_total)
+        gains[k] = parent_entropy - weighted_entropy
+
+    # Serial argmax keeps the first feature on ties, like the Python loop did
+    best = 0
+    for k in range(1, gains.shape[0]):
+        if gains[k] > gains[best]:
+            best = k
+    return feat_ids[best], gains[best]
+
+# n * log2(n), the building block of the incremental entropy update
+@njit(cache=True)
+def _nlog2n(n):
+    return n * math.log2(n) if n > 0 else 0.0
+
+# Best threshold of an ordinal feature in a single pass
+@njit(cache=True)
+def best_split_ordinal(col_sorted, y_sorted, n_classes, parent_entropy):
+    """Return (threshold, information_gain) of the best binary split.
+
+    Samples are moved one at a time from the right side to the left side.
+    Since n*H = n*log2(n) - sum(c*log2(c)), each move only updates the two
+    class-count terms it touches, so all thresholds are scored in O(N)
+    instead of recounting both sides for every candidate.
+    """
+    n = col_sorted.shape[0]
+    left = np.zeros(n_classes, np.int64)
+    right = np.zeros(n_classes, np.int64)
+    for i in range(n):
+        right[y_sorted[i]] += 1
+    left_sum = 0.0  # sum(c * log2(c)) over the left class counts
+    right_sum = 0.0
+    for c in range(n_classes):
+        right_sum += _nlog2n(right[c])
+
+    best_threshold = -1
+    best_gain = 0.0
+    for i in range(n - 1):
+        c = y_sorted[i]
+        left_sum += _nlog2n(left[c] + 1) - _nlog2n(left[c])
+        right_sum += _nlog2n(right[c] - 1) - _nlog2n(right[c])
+        left[c] += 1
+        right[c] -= 1
+        # Only boundaries between distinct values are valid thresholds
+        if col_sorted[i] == col_sorted[i + 1]:
+            continue
+        n_left = i + 1
+        n_right = n - n_left
+        weighted_entropy = (_nlog2n(n_left) - left_sum + _nlog2n(n_right) - right_sum) / n
+        gain = parent_entropy - weighted_entropy
+        if gain > best_gain:
+            best_gain = gain
+            best_threshold = col_sorted[i]
+    return best_threshold, best_gain
+
+# Class counts, majority class and entropy of a node in one pass
+@njit(cache=True)
+def _node_summary(y, idx):
+    """Return (class_counts, majority, entropy) of the rows in idx."""
+    n = idx.shape[0]
+    n_classes = 0
+    for i in range(n):
+        if y[idx[i]] >= n_classes:
+            n_classes = y[idx[i]] + 1
+    counts = np.zeros(n_classes, np.int64)
+    for i in range(n):
+        counts[y[idx[i]]] += 1
+    max_count = counts.max()
+    # Ties go to the class seen first
+    majority = 0
+    for i in range(n):
+        if counts[y[idx[i]]] == max_count:
+            majority = y[idx[i]]
+            break
+    return counts, majority, _entropy_of_counts(counts, n)
 
 # Build the decision tree
-def build_decision_tree(data, features=None, target_column=-1):
-    """Recursively builds a boolean decision tree."""
+def build_decision_tree(X, y, features=None, idx=None, ordinal_features=(), n_jobs=1,
+                        min_purity=1.0, min_samples_split=2, task_threshold=TASK_THRESHOLD):
+    """Builds a boolean decision tree from encoded arrays, returned as a Tree.
+
+    features: column indices to split on (default: all columns).
+    idx: row indices to train on (default: all rows).
+    ordinal_features: columns split on one threshold; codes must be in real order.
+    n_jobs: worker processes for large subtrees (None: one per CPU; needs a __main__ guard).
+    min_purity: majority share at which a node becomes a leaf.
+    min_samples_split: nodes with fewer rows become leaves.
+    task_threshold: minimum rows for a subtree to go to a worker.
+    """
+    if not 0 < min_purity <= 1:
+        raise ValueError(f"min_purity must be in (0, 1], got {min_purity}")
+    if min_samples_split < 2:
+        raise ValueError(f"min_samples_split must be at least 2, got {min_samples_split}")
+    if n_jobs is not None and n_jobs < 1:
+        raise ValueError(f"n_jobs must be None or at least 1, got {n_jobs}")
+    X = np.asfortranarray(X)
+    if idx is None:
+        idx = np.arange(len(y))
+    if features is None:
+        features = list(range(X.shape[1]))
+
     # If the dataset is empty, return None
-    if not data:
+    if len(idx) == 0:
         return None
 
-    # Check if all decisions are the same (leaf node)
-    unique_decisions = set(row[target_column] for row in data)
-    if len(unique_decisions) == 1:
-        return Node(decision=unique_decisions.pop())
+    tree = Tree()
+    stopping = (min_purity, min_samples_split)
+    # Too few rows for any subtree to reach a worker: skip starting the pool
+    if n_jobs == 1 or len(idx) < task_threshold:
+        _build_node(tree, X, y, features, idx, ordinal_features, stopping)
+        return tree
+    # X and y are shipped once per worker; tasks only carry row indices.
+    # Workers are spawned, not forked: forking once Numba's threading layer
+    # is running leaves the parent hanging at interpreter exit.
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=n_jobs, mp_context=context,
+                             initializer=_init_worker, initargs=(X, y)) as executor:
+        _build_node(tree, X, y, features, idx, ordinal_features, stopping, executor, task_threshold)
+    return tree
+
+# Worker-process state for parallel subtree construction
+_worker_X = None
+_worker_y = None
+
+def _init_worker(X, y):
+    global _worker_X, _worker_y
+    _worker_X = X
+    _worker_y = y
+    # Subtrees already run in parallel, so keep each worker's kernels serial
+    numba.set_num_threads(1)
+
+def _build_subtree(features, idx, ordinal_features, stopping):
+    tree = Tree()
+    _build_node(tree, _worker_X, _worker_y, features, idx, ordinal_features, stopping)
+    return tree
+
+# Recursively build one node and its children, returning the node's index
+def _build_node(tree, X, y, features, idx, ordinal_features, stopping, executor=None,
+                task_threshold=TASK_THRESHOLD, depth=0):
+    # Class counts, majority and entropy come from a single compiled pass
+    counts, majority, parent_entropy = _node_summary(y, idx)
+    majority = int(majority)
+
+    # Stop early on (nearly) pure or small nodes (leaf node)
+    min_purity, min_samples_split = stopping
+    if counts[majority] >= min_purity * len(idx) or len(idx) < min_samples_split:
+        return tree.add_node(majority)
 
     # If no features are left, return a leaf with the majority class
     if not features:
-        return Node(decision=majority_class(data, target_column))
+        return tree.add_node(majority)
 
     # Find the feature with the highest information gain
+    n_classes = len(counts)
     best_feature = None
+    best_threshold = None
     max_ig = -float('inf')
+    categorical = [f for f in features if f not in ordinal_features]
+    if categorical:
+        feat_ids = np.asarray(categorical, dtype=np.intp)
+        best_feature, max_ig = best_split(X, y, idx, feat_ids, n_classes, parent_entropy)
+        best_feature = int(best_feature)
     for feature_index in features:
-        ig = calculate_information_gain(feature_index, data, target_column)
+        if feature_index not in ordinal_features:
+            continue
+        # Counting sort on the small integer codes keeps this O(N) per node
+        _, sorted_idx, _ = _partition_by_value(X, idx, feature_index)
+        threshold, ig = best_split_ordinal(X[sorted_idx, feature_index], y[sorted_idx], n_classes, parent_entropy)
         if ig > max_ig:
             max_ig = ig
             best_feature = feature_index
+            best_threshold = int(threshold)
 
     # If no feature provides information gain, return a majority class leaf
     if max_ig <= 0:
-        return Node(decision=majority_class(data, target_column))
-
-    # Create a root node for the best feature
-    root = Node(feature=best_feature)
-
-    # Split the data and recursively build child nodes
-    subsets = split_data_by_feature(data, best_feature)
-    remaining_features = [f for f in features if f != best_feature]
-
-    for feature_value, subset in subsets.items():
-        child_node = build_decision_tree(subset, remaining_features, target_column)
-        root.children[feature_value] = child_node
-
-    return root
+        return tree.add_node(majority)
+
+    # Create a node for the best feature; it keeps the majority as a fallback
+    node_id = tree.add_node(majority, best_feature, -1 if best_threshold is None else best_threshold)
+
+    # Split the row indices and recursively build child nodes
+    if best_threshold is None:
+        subsets = split_data_by_feature(X, best_feature, idx)
+        remaining_features = [f for f in features if f != best_feature]
+    else:
+        subsets = split_data_by_threshold(X, best_feature, best_threshold, idx)
+        remaining_features = features
+
+    first = tree.add_children(node_id, list(subsets))
+    futures = {}
+    for slot, rows in enumerate(subsets.values(), start=first):
+        if executor is not None and depth < TASK_MAX_DEPTH and len(rows) >= task_threshold:
+            futures[slot] = executor.submit(_build_subtree, remaining_features, rows, ordinal_features, stopping)
+        else:
+            tree.child_node[slot] = _build_node(tree, X, y, remaining_features, rows, ordinal_features, stopping,
+                                                 executor, task_threshold, depth + 1)
+    for slot, future in futures.items():
+        tree.child_node[slot] = tree.graft(future.result())
+
+    return node_id
+
+# Walk the flat tree for every row (compiled)
+@njit(cache=True, parallel=True)
+def _predict_rows(feature, decision, threshold, first_child, n_children, child_value, child_node, X):
+    predictions = np.empty(X.shape[0], np.int32)
+    for i in prange(X.shape[0]):
+        node = 0
+        while feature[node] >= 0:
+            value = X[i, feature[node]]
+            if value < 0:
+                break  # UNSEEN_CODE: use this node's majority class
+            if threshold[node] >= 0:
+                value = 1 if value > threshold[node] else 0
+            next_node = -1
+            for k in range(first_child[node], first_child[node] + n_children[node]):
+                if child_value[k] == value:
+                    next_node = child_node[k]
+                    break
+            if next_node < 0:
+                break  # Unseen value: use this node's majority class
+            node = next_node
+        predictions[i] = decision[node]
+    return predictions
+
+# Predict a batch of rows
+def predict(tree, X):
+    """Return the predicted class code for every row of an encoded matrix.
+
+    X must use the training encoding: the training matrix itself, or new
+    rows passed through encode_rows. It is made C-contiguous (row-major) so
+    that the features a row visits on its way down the tree sit next to each
+    other in memory; rows are predicted in parallel.
+    """
+    X = np.ascontiguousarray(X)
+    nodes = tree.nodes[:tree.node_count]
+    max_feature = int(nodes['feature'].max())
+    if X.ndim != 2 or X.shape[1] <= max_feature:
+        raise ValueError(f"X must be 2-D with at least {max_feature + 1} feature columns, got shape {X.shape}")
+    return _predict_rows(nodes['feature'], nodes['decision'], nodes['threshold'],
+                         nodes['first_child'], nodes['n_children'],
+                         tree.child_value[:tree.child_count], tree.child_node[:tree.child_count], X)
 
 # Load CSV data
-def load_csv(filename):
-    with open(filename, 'r') as f:
-        reader = csv.reader(f)
-        data = list(reader)
-    return data
+def load_csv(filename, target_column=-1, delimiter=',', orders=None):
+    """Load a CSV file with a header row and encode it into (X, y, uniques).
+
+    delimiter: field separator, e.g. '\\t' for decision_tree_data.csv.
+    orders: as in encode_data, with column indices counted in the file.
+    """
+    df = pd.read_csv(filename, sep=delimiter, dtype='category', keep_default_na=False)
+    for column, order in (orders or {}).items():
+        name = df.columns[column]
+        ordered = df[name].cat.set_categories(list(order))
+        missing = ordered.cat.codes < 0
+        if missing.any():
+            raise ValueError(f"Column {column} value {df[name][missing].iloc[0]!r} is not in its given order")
+        df[name] = ordered
+    codes = [df[column].cat.codes.to_numpy() for column in df.columns]
+    uniques = [df[column].cat.categories.to_numpy() for column in df.columns]
+    return _assemble_codes(codes, uniques, target_column)
 
 #make some functions for testing
 def test_entropy_and_information_gain():
@@ -119,14 +598,15 @@ def test_entropy_and_information_gain():
         ['young', 'unknown', 'TRUE', 'yes']
     ]
     target_column = -1  # Target column is the last column (Decision)
+    X, y, _ = encode_data(data, target_column)
 
     # Test entropy calculation
-    entropy = calculate_entropy(data, target_column)
+    entropy = calculate_entropy(y)
     print(f"Entropy: {entropy}")  # Expected to be between 0 and 1
     
     # Test information gain for 'Age' feature (index 0)
     feature_index = 0
-    info_gain = calculate_information_gain(feature_index, data, target_column)
+    info_gain = calculate_information_gain(feature_index, X, y)
     print(f"Information Gain for 'Age' feature: {info_gain}")  # Expected to be a positive value
 
 def test_decision_tree_construction():
@@ -141,9 +621,10 @@ def test_decision_tree_construction():
     ]
     features = [0, 1, 2]  # Indices of features (Age, Credit Rating, Student)
     target_column = -1  # Target column (Decision)
+    X, y, _ = encode_data(data, target_column)
 
     # Build the decision tree
-    tree = build_decision_tree(data, features, target_column)
+    tree = build_decision_tree(X, y, features)
     print("Decision Tree:")
     print(tree)
 
@@ -165,9 +646,10 @@ def test_recursion_in_tree_construction():
     ]
     features = [0, 1, 2]  # Indices of features (Age, Credit Rating, Student)
     target_column = -1  # Target column (Decision)
+    X, y, _ = encode_data(data, target_column)
 
     # Build the decision tree
-    tree = build_decision_tree(data, features, target_column)
+    tree = build_decision_tree(X, y, features)
     print("Decision Tree with Recursion:")
     print(tree)
 
@@ -181,7 +663,8 @@ def test_different_datasets():
         ['senior', 'good', 'FALSE', 'no'],
         ['middle-aged', 'excellent', 'TRUE', 'yes']
     ]
-    tree_clear = build_decision_tree(data_clear, [0, 1, 2], -1)
+    X_clear, y_clear, _ = encode_data(data_clear, -1)
+    tree_clear = build_decision_tree(X_clear, y_clear, [0, 1, 2])
     print("Decision Tree for Clear Dataset:")
     print(tree_clear)
 
@@ -192,14 +675,109 @@ def test_different_datasets():
         ['young', 'fair', 'TRUE', 'yes'],
         ['middle-aged', 'fair', 'FALSE', 'no']
     ]
-    tree_mixed = build_decision_tree(data_mixed, [0, 1, 2], -1)
+    X_mixed, y_mixed, _ = encode_data(data_mixed, -1)
+    tree_mixed = build_decision_tree(X_mixed, y_mixed, [0, 1, 2])
     print("Decision Tree for Mixed Dataset:")
     print(tree_mixed)
 
+def test_ordinal_split():
+    # Test dataset: numeric ages, where young people answer 'no'
+    ages = [str(age) for age in range(5, 25)]
+    data = [[age, 'no' if int(age) <= 12 else 'yes'] for age in ages]
+    X, y, uniques = encode_data(data, -1, orders={0: ages})  # Rank ages numerically, not as strings
+
+    # Single-pass threshold search on the sorted column
+    n_classes = int(y.max()) + 1
+    threshold, info_gain = best_split_ordinal(X[:, 0], y, n_classes, calculate_entropy(y))
+    print(f"Best threshold: age <= {uniques[0][threshold]} (information gain {info_gain})")  # Expected to be age <= 12
+
+    # Build the decision tree with Age as an ordinal feature
+    tree = build_decision_tree(X, y, [0], ordinal_features={0})
+    print("Decision Tree with Ordinal Split:")
+    print(tree)
+    print(f"Threshold picked: age <= {uniques[0][tree.nodes[0]['threshold']]}")  # Expected to be age <= 12
+
+def test_early_stopping():
+    # Noisy dataset: the label follows the first feature 90% of the time
+    rng = np.random.default_rng(0)
+    X = rng.integers(0, 4, size=(2000, 5))
+    y = np.where(rng.random(2000) < 0.9, X[:, 0] % 2, 1 - X[:, 0] % 2)
+
+    # Lowering min_purity stops on nearly pure nodes instead of chasing noise
+    full_tree = build_decision_tree(X, y, min_purity=1.0)
+    pruned_tree = build_decision_tree(X, y, min_purity=0.9)
+    print(f"Nodes with min_purity=1.0: {full_tree.node_count}")
+    print(f"Nodes with min_purity=0.9: {pruned_tree.node_count}")  # Expected to be far fewer
+
+    # Out-of-range settings are rejected
+    try:
+        build_decision_tree(X, y, min_purity=1.5)
+    except ValueError as error:
+        print(f"Rejected: {error}")
+
+# Compare two trees node by node, ignoring how their nodes are numbered
+def _same_tree(a, b, node_a=0, node_b=0):
+    feature, decision, threshold, first_a, n_children = a.nodes[node_a].item()
+    feature_b, decision_b, threshold_b, first_b, n_children_b = b.nodes[node_b].item()
+    if (feature, decision, threshold, n_children) != (feature_b, decision_b, threshold_b, n_children_b):
+        return False
+    for k in range(n_children):
+        if a.child_value[first_a + k] != b.child_value[first_b + k]:
+            return False
+        if not _same_tree(a, b, a.child_node[first_a + k], b.child_node[first_b + k]):
+            return False
+    return True
+
+def test_parallel_build():
+    # Dataset large enough for several subtrees to go to worker processes
+    rng = np.random.default_rng(1)
+    X = rng.integers(0, 4, size=(3000, 6))
+    y = np.where(rng.random(3000) < 0.8, X[:, 0] % 2, X[:, 1] % 2)
+
+    # A low task_threshold sends subtrees to the workers and grafts them back
+    serial_tree = build_decision_tree(X, y)
+    parallel_tree = build_decision_tree(X, y, n_jobs=2, task_threshold=200)
+    print("Serial Tree:", serial_tree)
+    print("Parallel Tree:", parallel_tree)
+    print(f"Trees are identical: {_same_tree(serial_tree, parallel_tree)}")  # Expected to be True
+
+def test_prediction():
+    # Test dataset
+    data = [
+        ['middle-aged', 'unknown', 'unknown', 'yes'],
+        ['middle-aged', 'unknown', 'unknown', 'yes'],
+        ['senior', 'excellent', 'unknown', 'yes'],
+        ['senior', 'fair', 'unknown', 'no'],
+        ['young', 'unknown', 'FALSE', 'no'],
+        ['young', 'unknown', 'TRUE', 'yes']
+    ]
+    X, y, uniques = encode_data(data, -1)
+    tree = build_decision_tree(X, y, [0, 1, 2])
+
+    # Predict the training rows back; the tree should fit them all
+    predictions = predict(tree, X)
+    print("Predictions:", uniques[-1][predictions].tolist())
+    print(f"Training accuracy: {np.mean(predictions == y)}")  # Expected to be 1.0
+
+    # New rows must reuse the training encoding; 'outstanding' was never seen
+    new_rows = [
+        ['young', 'unknown', 'TRUE'],
+        ['senior', 'fair', 'unknown'],
+        ['young', 'outstanding', 'unknown'],  # Falls back to the root's majority
+    ]
+    new_predictions = predict(tree, encode_rows(new_rows, uniques))
+    print("Predictions for new rows:", uniques[-1][new_predictions].tolist())  # Expected ['yes', 'no', 'yes']
+
+    # Rows with a missing column are rejected rather than padded
+    try:
+        encode_rows([['young', 'unknown', 'TRUE'], ['young', 'unknown']], uniques)
+    except ValueError as error:
+        print(f"Rejected: {error}")
+
 # Example usage
 def main():
     # Load data from CSV file
-    data = load_csv('/workspaces/CSC416/CSC416/decision_tree_data.csv')  # Replace with your CSV file
+    X, y, uniques = load_csv('/workspaces/CSC416/CSC416/decision_tree_data.csv', delimiter='\t')  # Replace with your CSV file
 
     #testing some shit
     print("Testing Entropy and Information Gain:")
@@ -214,12 +792,23 @@ def main():
     print("\nTesting Different Datasets:")
     test_different_datasets()
 
+    print("\nTesting Ordinal Split:")
+    test_ordinal_split()
+
+    print("\nTesting Early Stopping:")
+    test_early_stopping()
+
+    print("\nTesting Parallel Build:")
+    test_parallel_build()
+
+    print("\nTesting Prediction:")
+    test_prediction()
+
     # Feature indices (assume all columns except the target column are features)
-    features = list(range(len(data[0]) - 1))
-    target_column = -1  # Last column is the target
+    features = list(range(X.shape[1]))
 
     # Build the decision tree to test
-    decision_tree = build_decision_tree(data, features, target_column)
+    decision_tree = build_decision_tree(X, y, features)
     print(decision_tree)
 
 if __name__ == "__main__":